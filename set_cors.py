@@ -1,15 +1,34 @@
-import boto3
+import argparse
+import functools
+import hashlib
+import json
+import os
+
+import botocore.session
 from botocore.client import Config
+from botocore.exceptions import ClientError, NoCredentialsError
+
+BUCKET = 'teamshots'
+
+# Per-user fingerprint of the last configuration applied from this machine
+FINGERPRINT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'teamshots-cors.sha')
+
+# Shared session: credentials come from the default chain (env vars,
+# ~/.aws/credentials, instance metadata) and endpoint/model lookups are
+# cached on it for every client created in this process.
+_session = botocore.session.Session()
+
+
+@functools.lru_cache(maxsize=1)
+def _s3():
+    # Configure the S3 client for Hetzner (built once per process)
+    return _session.create_client(
+        's3',
+        endpoint_url='https://nbg1.your-objectstorage.com',
+        config=Config(signature_version='s3v4'),
+        region_name='eu-central'
+    )
 
-# Configure the S3 client for Hetzner
-s3 = boto3.client(
-    's3',
-    endpoint_url='https://nbg1.your-objectstorage.com',
-    aws_access_key_id='GR1SI42EWCNJ7GFX4LKW',
-    aws_secret_access_key='FzgvPELmauAVJhPjp5ovynKBkDMmONKa6jF1CFW4',
-    config=Config(signature_version='s3v4'),
-    region_name='eu-central'
-)
 
 # CORS configuration for all production domains
 cors_configuration = {
@@ -39,17 +58,75 @@ cors_configuration = {
     ]
 }
 
-# Set CORS
-try:
-    s3.put_bucket_cors(
-        Bucket='teamshots',
-        CORSConfiguration=cors_configuration
-    )
-    print("CORS configuration set successfully!")
-    
-    # Get CORS to verify
-    response = s3.get_bucket_cors(Bucket='teamshots')
-    print("Current CORS configuration:", response['CORSRules'])
-
-except Exception as e:
-    print(f"Error: {e}")
+
+def _current_rules():
+    try:
+        return _s3().get_bucket_cors(Bucket=BUCKET)['CORSRules']
+    except ClientError as e:
+        # No CORS configuration on the bucket yet; anything else is a real failure
+        if e.response.get('Error', {}).get('Code') == 'NoSuchCORSConfiguration':
+            return None
+        raise
+
+
+def _fingerprint():
+    payload = json.dumps({'bucket': BUCKET, 'cors': cors_configuration}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _read_fingerprint():
+    # The fingerprint is only an optimisation: any read problem means "unknown"
+    try:
+        with open(FINGERPRINT_PATH) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _write_fingerprint(value):
+    try:
+        os.makedirs(os.path.dirname(FINGERPRINT_PATH), exist_ok=True)
+        with open(FINGERPRINT_PATH, 'w') as f:
+            f.write(value)
+    except OSError as e:
+        print(f"Warning: could not save CORS fingerprint to {FINGERPRINT_PATH}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply the CORS configuration to the teamshots bucket.')
+    parser.add_argument('--force', action='store_true',
+                        help='ignore the local fingerprint and check the bucket anyway')
+    args = parser.parse_args()
+
+    desired = cors_configuration['CORSRules']
+    fingerprint = _fingerprint()
+
+    # Nothing changed locally since the last successful run: skip the network entirely
+    if not args.force and _read_fingerprint() == fingerprint:
+        print("CORS configuration unchanged since last run, skipping (use --force to re-check).")
+        return
+
+    # Single GET up front; only PUT when the bucket differs
+    try:
+        if _current_rules() == desired:
+            print("CORS configuration already up to date, nothing to do.")
+            _write_fingerprint(fingerprint)
+            return
+
+        _s3().put_bucket_cors(
+            Bucket=BUCKET,
+            CORSConfiguration=cors_configuration
+        )
+        print("CORS configuration set successfully!")
+        print("Applied CORS configuration:", desired)
+        _write_fingerprint(fingerprint)
+
+    except NoCredentialsError:
+        print("Error: no S3 credentials found. Set AWS_ACCESS_KEY_ID and "
+              "AWS_SECRET_ACCESS_KEY or configure an AWS profile.")
+    except Exception as e:
+        print(f"Error: {e}")
+
+
+if __name__ == '__main__':
+    main()